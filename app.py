@@ -1,7 +1,6 @@
 import streamlit as st
-import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
 from simulation import BusinessSimulator
 
 st.set_page_config(page_title="Business Decision Simulator", layout="wide")
@@ -50,38 +49,21 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-st.title("Business Decision Simulator")
-st.markdown("Test your startup strategy with Monte Carlo simulations.")
-
-# --- Sidebar Inputs ---
-with st.sidebar:
-    st.header("1. Company State")
-    start_cash = st.number_input("Starting Cash ($)", value=500000, step=10000)
-    monthly_revenue = st.number_input("Monthly Revenue ($)", value=20000, step=1000)
-    monthly_burn = st.number_input("Monthly Burn ($)", value=50000, step=1000)
-    team_size = st.number_input("Current Team Size", value=5, step=1)
-    
-    st.subheader("Unit Economics")
-    cac = st.number_input("CAC ($)", value=50.0, step=5.0, help="Customer Acquisition Cost")
-    arpu = st.number_input("ARPU ($)", value=100.0, step=5.0, help="Average Revenue Per User per Month")
-
-    st.header("2. Strategy Decisions")
-    hiring_strategy = st.selectbox("Hiring Strategy", ["None", "Moderate", "Aggressive"], index=1)
-    marketing_strategy = st.selectbox("Marketing Strategy", ["Same", "Double"], index=0)
-
-    st.header("3. Simulation Settings")
-    months = st.slider("Time Horizon (Months)", 6, 36, 12)
-    runs = st.slider("Number of Simulations", 100, 1000, 500)
-    
-    run_btn = st.button("Run Simulation")
+# --- Simulation (cached on inputs) ---
+# The simulator object is cached as a shared resource, its results as data
+@st.cache_resource(max_entries=32)
+def get_sim(start_cash, monthly_revenue, monthly_burn, team_size, cac, arpu):
+    return BusinessSimulator(start_cash, monthly_revenue, monthly_burn, team_size, cac, arpu)
 
-# --- Main Content ---
-if run_btn:
-    with st.spinner("Simulating 500 futures..."):
-        sim = BusinessSimulator(start_cash, monthly_revenue, monthly_burn, team_size, cac, arpu)
-        raw_results = sim.run_simulation(months, runs, hiring_strategy, marketing_strategy)
-        agg_results = sim.process_results(raw_results)
+@st.cache_data(max_entries=32)
+def run_sim(start_cash, monthly_revenue, monthly_burn, team_size, cac, arpu,
+            months, runs, hiring_strategy, marketing_strategy):
+    sim = get_sim(start_cash, monthly_revenue, monthly_burn, team_size, cac, arpu)
+    raw_results = sim.run_simulation(months, runs, hiring_strategy, marketing_strategy)
+    return sim.process_results(raw_results)
 
+# --- Results ---
+def render_results(agg_results, start_cash, monthly_revenue, monthly_burn, hiring_strategy):
     # --- Top Metrics ---
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -126,31 +108,33 @@ if run_btn:
     # 1. Cash Flow Over Time
     st.subheader("Cash Flow Projection")
     
-    df_cash = pd.DataFrame({
-        'Month': agg_results['months'],
-        'Median Cash': agg_results['median_cash'],
-        '10th Percentile': agg_results['p10_cash'],
-        '90th Percentile': agg_results['p90_cash']
-    })
-    
+    months_arr = np.asarray(agg_results['months'])
     fig_cash = go.Figure()
     
-    # Confidence Band
-    fig_cash.add_trace(go.Scatter(
-        x=pd.concat([df_cash['Month'], df_cash['Month'][::-1]]),
-        y=pd.concat([df_cash['90th Percentile'], df_cash['10th Percentile'][::-1]]),
-        fill='toself',
+    # Confidence Band (90th percentile filled down to the 10th)
+    fig_cash.add_trace(go.Scattergl(
+        x=months_arr,
+        y=agg_results['p10_cash'],
+        line=dict(width=0),
+        mode='lines',
+        hoverinfo="skip",
+        showlegend=False
+    ))
+    fig_cash.add_trace(go.Scattergl(
+        x=months_arr,
+        y=agg_results['p90_cash'],
+        fill='tonexty',
         fillcolor='rgba(0,100,80,0.2)',
-        line=dict(color='rgba(255,255,255,0)'),
+        line=dict(width=0),
+        mode='lines',
         hoverinfo="skip",
-        showlegend=True,
         name='10th-90th Percentile'
     ))
     
     # Median Line
-    fig_cash.add_trace(go.Scatter(
-        x=df_cash['Month'],
-        y=df_cash['Median Cash'],
+    fig_cash.add_trace(go.Scattergl(
+        x=months_arr,
+        y=agg_results['median_cash'],
         line=dict(color='rgb(0,100,80)', width=3),
         mode='lines',
         name='Median Cash'
@@ -174,18 +158,64 @@ if run_btn:
 
     # 2. Final Cash Distribution
     st.subheader("Final Cash Distribution")
-    fig_hist = px.histogram(
-        x=agg_results['final_cash'],
-        nbins=30,
-        labels={'x': 'Final Cash ($)'},
-        color_discrete_sequence=['#636EFA']
-    )
+    counts, edges = np.histogram(agg_results['final_cash'], bins=30)
+    centers = 0.5 * (edges[:-1] + edges[1:])
+    fig_hist = go.Figure(go.Bar(
+        x=centers,
+        y=counts,
+        width=np.diff(edges),
+        marker_color='#636EFA'
+    ))
     fig_hist.update_layout(
+        xaxis_title="Final Cash ($)",
+        yaxis_title="count",
         template="plotly_white", 
         showlegend=False,
         margin=dict(l=20, r=20, t=30, b=20)
     )
     st.plotly_chart(fig_hist, use_container_width=True)
 
+st.title("Business Decision Simulator")
+st.markdown("Test your startup strategy with Monte Carlo simulations.")
+
+# --- Sidebar Inputs ---
+with st.sidebar:
+    st.header("1. Company State")
+    start_cash = st.number_input("Starting Cash ($)", value=500000, step=10000)
+    monthly_revenue = st.number_input("Monthly Revenue ($)", value=20000, step=1000)
+    monthly_burn = st.number_input("Monthly Burn ($)", value=50000, step=1000)
+    team_size = st.number_input("Current Team Size", value=5, step=1)
+    
+    st.subheader("Unit Economics")
+    cac = st.number_input("CAC ($)", value=50.0, step=5.0, help="Customer Acquisition Cost")
+    arpu = st.number_input("ARPU ($)", value=100.0, step=5.0, help="Average Revenue Per User per Month")
+
+    st.header("2. Strategy Decisions")
+    hiring_strategy = st.selectbox("Hiring Strategy", ["None", "Moderate", "Aggressive"], index=1)
+    marketing_strategy = st.selectbox("Marketing Strategy", ["Same", "Double"], index=0)
+
+    st.header("3. Simulation Settings")
+    months = st.slider("Time Horizon (Months)", 6, 36, 12)
+    runs = st.slider("Number of Simulations", 100, 1000, 500)
+    
+    run_btn = st.button("Run Simulation")
+
+# --- Main Content ---
+if run_btn:
+    with st.spinner("Simulating 500 futures..."):
+        st.session_state['last_results'] = run_sim(
+            start_cash, monthly_revenue, monthly_burn, team_size, cac, arpu,
+            months, runs, hiring_strategy, marketing_strategy
+        )
+    # The advisor compares against the inputs of the run, not later sidebar edits
+    st.session_state['last_inputs'] = {
+        'start_cash': start_cash,
+        'monthly_revenue': monthly_revenue,
+        'monthly_burn': monthly_burn,
+        'hiring_strategy': hiring_strategy
+    }
+
+if 'last_results' in st.session_state:
+    render_results(st.session_state['last_results'], **st.session_state['last_inputs'])
 else:
     st.info("👈 Adjust settings in the sidebar and click 'Run Simulation' to start.")
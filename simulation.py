@@ -1,8 +1,164 @@
+from collections import namedtuple
+
 import numpy as np
-import pandas as pd
+
+try:
+    from numba import config, njit, prange
+    HAS_NUMBA = True
+    # Streamlit calls the kernel from script threads; TBB can hang on
+    # interpreter exit in that case, so prefer OpenMP when it is available
+    config.THREADING_LAYER_PRIORITY = ['omp', 'tbb', 'workqueue']
+except ImportError:
+    # Numba is optional; without it run_simulation uses the NumPy path
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+# Strategy names are mapped to small integer codes once, outside the hot loop,
+# and the codes index lookup tables instead of comparing strings
+HIRING_CODES = {'None': 0, 'Moderate': 1, 'Aggressive': 2}
+MARKETING_CODES = {'Same': 0, 'Double': 1}
+NEW_HIRES = np.array([0, 1, 2], np.int8)  # new hires per month, by hiring code
+MARKETING_BUDGET = np.array([0.0, 5000.0])  # extra marketing spend, by marketing code
+SALARY_PER_HEAD = 8000.0  # Assumption: Monthly salary
+
+# Company state for one month; immutable, so histories can hold it without copying
+State = namedtuple('State', 'cash revenue burn headcount alive')
+
+# One record per (run, month) in run_simulation's output. Aligned so each
+# field view (e.g. results['cash']) is a properly aligned float32/int32 array
+STEP_DTYPE = np.dtype([
+    ('cash', 'f4'),
+    ('revenue', 'f4'),
+    ('burn', 'f4'),
+    ('headcount', 'i4'),
+    ('alive', '?')
+], align=True)
+
+
+@njit(cache=True, fastmath=True)
+def _step(cash, revenue, burn, delta_burn, paid_revenue, arpu_scale,
+          demand_shock, bad_month, cost_spike):
+    """
+    Compiled version of `BusinessSimulator.step` for a single live run.
+    delta_burn, paid_revenue and arpu_scale are computed once by the caller.
+    The customer model is folded into revenue so each update is a
+    multiply-add that fastmath can contract into one FMA:
+        revenue' = revenue * (1 - churn + organic * demand) * arpu_scale
+                   + paid_revenue * demand
+    Returns (cash, revenue, burn); the caller handles death.
+    """
+    organic_growth_rate = 0.02
+    churn_rate = 0.15 if bad_month else 0.05
+    cost_shock = 0.10 if cost_spike else 0.0
+    demand = 1.0 + demand_shock
+
+    growth = (organic_growth_rate * demand + (1.0 - churn_rate)) * arpu_scale
+    revenue = revenue * growth + paid_revenue * demand
+    burn = burn + delta_burn
+    burn = burn * cost_shock + burn
+    cash = cash + revenue - burn
+    return cash, revenue, burn
+
+
+@njit(cache=True, parallel=True)
+def _run(cash0, rev0, burn0, delta_burn, paid_revenue, arpu_scale,
+         demand_shock, bad_month, cost_spike,
+         out_cash, out_revenue, out_burn, out_alive):
+    """
+    Loop-style Monte Carlo kernel, parallel over runs.
+    Fills the (runs, months) output arrays in place.
+    """
+    months, runs = demand_shock.shape
+    if cash0 <= 0:
+        # Bankrupt before the first month: `step` returns the dead state
+        out_cash[:, :] = 0.0
+        out_revenue[:, :] = 0.0
+        out_burn[:, :] = 0.0
+        out_alive[:, :] = False
+        return
+    for i in prange(runs):
+        cash = cash0
+        revenue = rev0
+        burn = burn0
+        for t in range(months):
+            cash, revenue, burn = _step(
+                cash, revenue, burn, delta_burn, paid_revenue, arpu_scale,
+                demand_shock[t, i], bad_month[t, i], cost_spike[t, i]
+            )
+            if cash <= 0:
+                # Dead state is constant: fill the remaining months in one go
+                out_cash[i, t:] = 0.0
+                out_revenue[i, t:] = revenue
+                out_burn[i, t:] = burn
+                out_alive[i, t:] = False
+                break
+            out_cash[i, t] = cash
+            out_revenue[i, t] = revenue
+            out_burn[i, t] = burn
+            out_alive[i, t] = True
+
+
+def _run_vectorized(cash0, rev0, burn0, delta_burn, paid_revenue, arpu_scale,
+                    demand_shock, bad_month, cost_spike,
+                    out_cash, out_revenue, out_burn, out_alive):
+    """
+    NumPy version of `_run`: every run advances together as a (runs,) array
+    with one Python loop over months.
+    """
+    months, runs = demand_shock.shape
+    # A run that starts bankrupt is dead from month one, like `step`
+    alive = np.full(runs, cash0 > 0)
+    cash = np.full(runs, max(cash0, 0.0))
+    revenue = np.where(alive, rev0, 0.0)
+    burn = np.where(alive, burn0, 0.0)
+
+    organic_growth_rate = 0.02
+
+    for t in range(months):
+        # Same folded revenue update as `_step`
+        demand = 1 + demand_shock[t]
+        churn_rate = 0.05 + 0.10 * bad_month[t]
+        growth = (organic_growth_rate * demand + (1 - churn_rate)) * arpu_scale
+
+        next_revenue = revenue * growth + paid_revenue * demand
+        next_burn = (burn + delta_burn) * (1 + 0.10 * cost_spike[t])
+        next_cash = cash + next_revenue - next_burn
+
+        # Dead runs keep their final state
+        revenue = np.where(alive, next_revenue, revenue)
+        burn = np.where(alive, next_burn, burn)
+        cash = np.where(alive, next_cash, cash)
+
+        alive &= cash > 0
+        cash = np.maximum(cash, 0)
+
+        out_cash[:, t] = cash
+        out_revenue[:, t] = revenue
+        out_burn[:, t] = burn
+        out_alive[:, t] = alive
+
+        if not alive.any():
+            # Every run is dead: broadcast the final state over the tail
+            out_cash[:, t + 1:] = 0
+            out_revenue[:, t + 1:] = revenue[:, None]
+            out_burn[:, t + 1:] = burn[:, None]
+            out_alive[:, t + 1:] = False
+            break
+
 
 class BusinessSimulator:
-    def __init__(self, start_cash, monthly_revenue, monthly_burn, team_size, cac, arpu):
+    def __init__(self, start_cash, monthly_revenue, monthly_burn, team_size, cac=None, arpu=None):
+        """
+        cac: customer acquisition cost.
+        arpu: average revenue per user.
+        If either is None the paid-customer term is disabled and revenue is
+        tracked directly: revenue * (1 + growth * (1 + shock) - churn).
+        """
         self.start_cash = start_cash
         self.start_revenue = monthly_revenue
         self.start_burn = monthly_burn
@@ -13,54 +169,45 @@ class BusinessSimulator:
     def step(self, current_state, strategy_hiring, strategy_marketing):
         """
         Simulates one month.
-        current_state: dict with keys 'cash', 'revenue', 'burn', 'headcount'
+        current_state: State (cash, revenue, burn, headcount, alive)
         strategy_hiring: 'Aggressive', 'Moderate', 'None'
         strategy_marketing: 'Double', 'Same'
         """
-        cash = current_state['cash']
-        revenue = current_state['revenue']
-        burn = current_state['burn']
-        headcount = current_state['headcount']
+        cash = current_state.cash
+        revenue = current_state.revenue
+        burn = current_state.burn
+        headcount = current_state.headcount
 
         if cash <= 0:
-            return {
-                'cash': 0,
-                'revenue': 0,
-                'burn': 0,
-                'headcount': headcount,
-                'alive': False
-            }
+            return State(cash=0, revenue=0, burn=0, headcount=headcount, alive=False)
 
         # 1. Apply Strategy Impact
         # Hiring
         hiring_cost_per_head = 5000 # Assumption: Cost to hire + salary impact
-        salary_per_head = 8000 # Assumption: Monthly salary
         
-        new_hires = 0
-        if strategy_hiring == 'Aggressive':
-            new_hires = 2
-        elif strategy_hiring == 'Moderate':
-            new_hires = 1
+        new_hires = int(NEW_HIRES[HIRING_CODES[strategy_hiring]])
         
         headcount += new_hires
-        burn += (new_hires * salary_per_head)
+        burn += (new_hires * SALARY_PER_HEAD)
         
         # Marketing & Growth (Unit Economics Model)
-        marketing_budget = 0
         organic_growth_rate = 0.02 # 2% organic word-of-mouth
-        
-        if strategy_marketing == 'Double':
-            marketing_budget = 5000 # Extra marketing spend
+        marketing_budget = float(MARKETING_BUDGET[MARKETING_CODES[strategy_marketing]])
         
         burn += marketing_budget
 
         # Calculate new customers from marketing
-        # Avoid division by zero if CAC is 0 (unlikely but safe)
-        cac = max(self.cac, 1.0) 
-        paid_customers = marketing_budget / cac
+        # (only when both CAC and ARPU are modelled)
+        paid_customers = 0
+        if self.cac is not None and self.arpu is not None:
+            # Avoid division by zero if CAC is 0 (unlikely but safe)
+            cac = max(self.cac, 1.0) 
+            paid_customers = marketing_budget / cac
         
         # Calculate current customers
-        current_customers = revenue / max(self.arpu, 1.0)
+        # Without an ARPU, one "customer" is one dollar of revenue
+        arpu = self.arpu if self.arpu is not None else 1.0
+        current_customers = revenue / max(arpu, 1.0)
         
         # Organic growth
         organic_customers = current_customers * organic_growth_rate
@@ -88,7 +235,7 @@ class BusinessSimulator:
             cost_shock = 0.10
             
         # 3. Update State
-        revenue = next_customers * self.arpu
+        revenue = next_customers * arpu
         
         burn = burn * (1 + cost_shock)
         
@@ -99,73 +246,75 @@ class BusinessSimulator:
             cash = 0
             alive = False
             
-        return {
-            'cash': cash,
-            'revenue': revenue,
-            'burn': burn,
-            'headcount': headcount,
-            'alive': alive
-        }
+        return State(cash=cash, revenue=revenue, burn=burn, headcount=headcount, alive=alive)
 
     def run_simulation(self, months, runs, strategy_hiring, strategy_marketing):
-        results = []
-        
-        for _ in range(runs):
-            state = {
-                'cash': self.start_cash,
-                'revenue': self.start_revenue,
-                'burn': self.start_burn,
-                'headcount': self.start_headcount,
-                'alive': True
-            }
-            
-            run_history = []
-            
-            for month in range(months):
-                if not state['alive']:
-                    # Fill remaining months with dead state
-                    run_history.append(state.copy())
-                    continue
-                    
-                state = self.step(state, strategy_hiring, strategy_marketing)
-                run_history.append(state.copy())
-            
-            results.append(run_history)
-            
-        return results
+        """
+        Runs all Monte Carlo paths.
+        Uses the compiled `_run` kernel when Numba is installed, otherwise the
+        vectorized NumPy path. Both apply the same per-step math as `step`.
+        Returns a (runs, months) array of STEP_DTYPE records; a field such as
+        results['cash'] is a zero-copy (runs, months) view.
+        """
+        rng = np.random.default_rng()
+
+        # Uncertainty: draw every month's shocks up-front in a single call
+        u = rng.random((3, months, runs), dtype=np.float32)
+        demand_shock = u[0] * 0.10 - 0.05  # U(-0.05, 0.05)
+        bad_month = u[1] < 0.10            # 10% chance of churn spike
+        cost_spike = u[2] < 0.05           # 5% chance of +10% burn
+
+        out = np.empty((runs, months), STEP_DTYPE)
+
+        # Strategy impact does not depend on state, so compute it once
+        new_hires = int(NEW_HIRES[HIRING_CODES[strategy_hiring]])
+        marketing_budget = float(MARKETING_BUDGET[MARKETING_CODES[strategy_marketing]])
+        delta_burn = new_hires * SALARY_PER_HEAD + marketing_budget
+        # Paid customers per month; 0 unless both CAC and ARPU are modelled
+        paid_customers = 0.0
+        if self.cac is not None and self.arpu is not None:
+            paid_customers = marketing_budget / max(self.cac, 1.0)
+        # Without an ARPU, one "customer" is one dollar of revenue
+        arpu = 1.0 if self.arpu is None else float(self.arpu)
+        paid_revenue = paid_customers * arpu
+        # Customers are counted as revenue / max(arpu, 1), then priced at arpu
+        arpu_scale = arpu / max(arpu, 1.0)
+
+        kernel = _run if HAS_NUMBA else _run_vectorized
+        kernel(
+            float(self.start_cash), float(self.start_revenue), float(self.start_burn),
+            delta_burn, paid_revenue, arpu_scale,
+            demand_shock, bad_month, cost_spike,
+            out['cash'], out['revenue'], out['burn'], out['alive']
+        )
+
+        # Headcount grows by new_hires on every executed step, including the
+        # month a run dies, and is frozen afterwards. A run that starts
+        # bankrupt never hires.
+        steps_taken = np.cumsum(out['alive'], axis=1)
+        if self.start_cash > 0:
+            steps_taken += ~out['alive']
+        out['headcount'] = self.start_headcount + new_hires * steps_taken
+
+        return out
 
     def process_results(self, results):
         """
         Aggregates results for visualization.
         """
-        # Convert to 3D array: [runs, months, features] is hard because dicts
-        # Let's use pandas for easier aggregation
-        
         # We want:
         # 1. Median cash per month + 10th/90th percentile
         # 2. Survival rate (percentage of runs alive at end)
         # 3. Final cash distribution
         
-        months = len(results[0])
-        runs = len(results)
-        
-        cash_matrix = np.zeros((runs, months))
-        alive_final = []
-        final_cash = []
+        cash_matrix = results['cash']
+        months = cash_matrix.shape[1]
         
-        for i, run in enumerate(results):
-            for t, step in enumerate(run):
-                cash_matrix[i, t] = step['cash']
-            
-            alive_final.append(run[-1]['alive'])
-            final_cash.append(run[-1]['cash'])
-            
-        # Cash stats
-        median_cash = np.median(cash_matrix, axis=0)
-        p10_cash = np.percentile(cash_matrix, 10, axis=0)
-        p90_cash = np.percentile(cash_matrix, 90, axis=0)
+        # Cash stats (one quantile call shares the partial sort)
+        p10_cash, median_cash, p90_cash = np.quantile(cash_matrix, [0.1, 0.5, 0.9], axis=0)
         
-        survival_rate = sum(alive_final) / runs
+        final_cash = cash_matrix[:, -1]
+        survival_rate = results['alive'][:, -1].mean()
         
         return {
             'median_cash': median_cash,
@@ -173,5 +322,5 @@ class BusinessSimulator:
             'p90_cash': p90_cash,
             'survival_rate': survival_rate,
             'final_cash': final_cash,
-            'months': list(range(1, months + 1))
+            'months': np.arange(1, months + 1)
         }
@@ -1,5 +1,8 @@
 import unittest
-from simulation import BusinessSimulator
+from unittest import mock
+import numpy as np
+import simulation
+from simulation import BusinessSimulator, State
 
 class TestBusinessSimulator(unittest.TestCase):
     def setUp(self):
@@ -21,47 +24,97 @@ class TestBusinessSimulator(unittest.TestCase):
         # We need to mock random to make it deterministic, or just check ranges
         # For simplicity, let's check if cash updates correctly roughly
         
-        state = {
-            'cash': 100000,
-            'revenue': 10000,
-            'burn': 5000,
-            'headcount': 5,
-            'alive': True
-        }
+        state = State(cash=100000, revenue=10000, burn=5000, headcount=5, alive=True)
         
         # Run one step
         new_state = self.sim.step(state, 'None', 'Same')
         
         # Cash should be approx 100000 + 10000 - 5000 = 105000
         # Allowing for random noise
-        self.assertTrue(100000 < new_state['cash'] < 110000)
-        self.assertTrue(new_state['alive'])
+        self.assertTrue(100000 < new_state.cash < 110000)
+        self.assertTrue(new_state.alive)
 
     def test_death_condition(self):
-        state = {
-            'cash': 100,
-            'revenue': 0,
-            'burn': 5000,
-            'headcount': 5,
-            'alive': True
-        }
+        state = State(cash=100, revenue=0, burn=5000, headcount=5, alive=True)
         new_state = self.sim.step(state, 'None', 'Same')
-        self.assertFalse(new_state['alive'])
-        self.assertEqual(new_state['cash'], 0)
+        self.assertFalse(new_state.alive)
+        self.assertEqual(new_state.cash, 0)
 
     def test_hiring_impact(self):
-        state = {
-            'cash': 100000,
-            'revenue': 10000,
-            'burn': 5000,
-            'headcount': 5,
-            'alive': True
-        }
+        state = State(cash=100000, revenue=10000, burn=5000, headcount=5, alive=True)
         # Aggressive hiring adds 2 people
         new_state = self.sim.step(state, 'Aggressive', 'Same')
-        self.assertEqual(new_state['headcount'], 7)
+        self.assertEqual(new_state.headcount, 7)
         # Burn should increase significantly (5000 + 2*8000 salary + hiring costs)
-        self.assertTrue(new_state['burn'] > 5000)
+        self.assertTrue(new_state.burn > 5000)
+
+    def test_without_unit_economics(self):
+        sim = BusinessSimulator(100000, 10000, 5000, 5)
+        self.assertIsNone(sim.cac)
+        state = State(cash=100000, revenue=10000, burn=5000, headcount=5, alive=True)
+        # Marketing spend adds no paid customers, revenue follows organic
+        # growth (~2%) minus churn (5% or 15%)
+        new_state = sim.step(state, 'None', 'Double')
+        self.assertTrue(8500 < new_state.revenue < 10000)
+        self.assertTrue(new_state.burn > 5000)
+
+        results = sim.run_simulation(12, 20, 'None', 'Same')
+        self.assertTrue(results['alive'][:, -1].all())
+
+        # CAC without ARPU has no price for paid customers, so it adds nothing
+        sim_cac_only = BusinessSimulator(100000, 10000, 5000, 5, cac=50)
+        with mock.patch('numpy.random.uniform', return_value=0.0), \
+                mock.patch('numpy.random.random', return_value=0.5):
+            self.assertEqual(sim_cac_only.step(state, 'None', 'Double'),
+                             sim.step(state, 'None', 'Double'))
+
+    def test_run_simulation_shape(self):
+        results = self.sim.run_simulation(12, 50, 'Moderate', 'Same')
+        self.assertEqual(results.dtype, simulation.STEP_DTYPE)
+        self.assertEqual(results.shape, (50, 12))
+        self.assertEqual(results['cash'].dtype, np.float32)
+        self.assertTrue(results['cash'].flags.aligned)
+        # Moderate hiring adds one head per month (all runs survive months 1-3)
+        self.assertTrue(results['alive'][:, :3].all())
+        self.assertTrue((results['headcount'][:, :3] == [6, 7, 8]).all())
+        # Cash never goes negative and dead runs stay dead
+        self.assertTrue((results['cash'] >= 0).all())
+        self.assertFalse((~results['alive'][:, :-1] & results['alive'][:, 1:]).any())
+
+    def test_bankrupt_at_start(self):
+        sim = BusinessSimulator(0, 20000, 5000, 5, 50, 100)
+        state = State(cash=0, revenue=20000, burn=5000, headcount=5, alive=True)
+        expected = sim.step(state, 'Moderate', 'Same')
+        self.assertFalse(expected.alive)
+
+        backends = [False, True] if simulation.HAS_NUMBA else [False]
+        for has_numba in backends:
+            with self.subTest(numba=has_numba), \
+                    mock.patch.object(simulation, 'HAS_NUMBA', has_numba):
+                results = sim.run_simulation(12, 20, 'Moderate', 'Same')
+                for field in State._fields:
+                    self.assertTrue((results[field] == getattr(expected, field)).all(), field)
+
+    @unittest.skipUnless(simulation.HAS_NUMBA, "numba not installed")
+    def test_numba_matches_vectorized(self):
+        rng = np.random.default_rng(0)
+        months, runs = 12, 200
+        demand_shock = rng.uniform(-0.05, 0.05, (months, runs))
+        bad_month = rng.random((months, runs)) < 0.10
+        cost_spike = rng.random((months, runs)) < 0.05
+
+        outputs = []
+        for kernel in (simulation._run, simulation._run_vectorized):
+            out = [np.empty((runs, months), np.float32) for _ in range(3)]
+            out.append(np.empty((runs, months), bool))
+            # Aggressive hiring + double marketing: 2 * 8000 + 5000 extra burn,
+            # 5000 / 50 paid customers per month at 100 ARPU
+            kernel(100000.0, 10000.0, 20000.0, 21000.0, 10000.0, 1.0,
+                   demand_shock, bad_month, cost_spike, *out)
+            outputs.append(out)
+
+        for numba_arr, numpy_arr in zip(*outputs):
+            np.testing.assert_allclose(numba_arr, numpy_arr, rtol=1e-5)
 
 if __name__ == '__main__':
     unittest.main()